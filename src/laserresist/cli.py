@@ -2,13 +2,14 @@
 
 import argparse
 import json
+import os
 import sys
 import warnings
 import zipfile
 import tempfile
 import shutil
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple, Union
 
 try:
     import yaml
@@ -100,22 +101,23 @@ def find_gerber_files(folder: Path, side: str = 'front') -> Dict[str, Optional[P
     return files
 
 
-def load_config(config_path: Path) -> Dict[str, Any]:
+def load_config(config_path: Union[str, Path]) -> Dict[str, Any]:
     """Load configuration from JSON or YAML file.
 
     Args:
-        config_path: Path to config file
+        config_path: Path to config file (str or Path)
 
     Returns:
         Dictionary of configuration values
     """
-    if not config_path.exists():
-        print(f"Error: Config file '{config_path}' not found")
+    path = os.fspath(config_path)
+    if not os.path.exists(path):
+        print(f"Error: Config file '{path}' not found")
         sys.exit(1)
 
-    suffix = config_path.suffix.lower()
+    suffix = os.path.splitext(path)[1].lower()
 
-    with open(config_path, 'r') as f:
+    with open(path, 'r') as f:
         if suffix == '.json':
             config = json.load(f)
         elif suffix in ['.yaml', '.yml']:
@@ -130,11 +132,11 @@ def load_config(config_path: Path) -> Dict[str, Any]:
     # Validate config keys
     known_keys = {
         # Fill generation
-        'line_spacing', 'initial_offset', 'forced_pad_centerlines', 'offset_centerlines', 'force_trace_centerlines', 'force_trace_centerlines_max_thickness', 'double_expose_isolated', 'isolation_threshold', 'bloom_compensation', 'bloom_resolution', 'bloom_spot_sigma', 'bloom_scatter_sigma', 'bloom_scatter_fraction', 'bloom_threshold_percentile', 'bloom_debug_image',
+        'line_spacing', 'initial_offset', 'forced_pad_centerlines', 'offset_centerlines', 'force_trace_centerlines', 'force_trace_centerlines_max_thickness', 'double_expose_isolated', 'isolation_threshold', 'merge_paths', 'bloom_compensation', 'bloom_resolution', 'bloom_spot_sigma', 'bloom_scatter_sigma', 'bloom_scatter_fraction', 'bloom_threshold_percentile', 'bloom_debug_image',
         # Laser settings
         'laser_power', 'feed_rate', 'travel_rate', 'z_height',
         # Coordinate transformation
-        'x_offset', 'y_offset', 'no_normalize', 'flip_horizontal',
+        'x_offset', 'y_offset', 'no_normalize', 'flip_horizontal', 'no_path_comments',
         # Bed mesh
         'bed_mesh', 'mesh_offset', 'probe_count',
         # Laser control
@@ -142,7 +144,7 @@ def load_config(config_path: Path) -> Dict[str, Any]:
         # Outline
         'draw_outline', 'outline_offset_count',
         # Pin mode
-        'pin_mode', 'pin_macro',
+        'pin_mode', 'pin_macro', 'pin1_x', 'pin1_y', 'pin2_x', 'pin2_y',
         # Template generation
         'generate_template_stl', 'stl_name', 'template_block_height',
         'template_wall_thickness', 'hole_print_tolerance', 'pcb_safety_offset',
@@ -152,7 +154,7 @@ def load_config(config_path: Path) -> Dict[str, Any]:
 
     unknown_keys = set(config.keys()) - known_keys
     if unknown_keys:
-        print(f"\nWarning: Unknown configuration keys in {config_path.name}:")
+        print(f"\nWarning: Unknown configuration keys in {os.path.basename(path)}:")
         for key in sorted(unknown_keys):
             print(f"  - {key}")
         print("These keys will be ignored. Check for typos or see config_example.yaml for valid keys.\n")
@@ -160,6 +162,55 @@ def load_config(config_path: Path) -> Dict[str, Any]:
     return config
 
 
+PIN_SNAP_TOLERANCE = 0.5  # Max distance (mm) from a configured pin to its hole, beyond the hole radius
+
+
+def select_pins_from_config(config: Dict[str, Any], holes: List[Dict]) -> Optional[Tuple[Dict, Dict]]:
+    """Select alignment pins from config coordinates instead of the interactive UI.
+
+    Each configured position is snapped to the nearest drill hole, so the returned
+    pins carry the same x, y, diameter info as a selection made in the UI. A position
+    only snaps to a hole within the hole radius (or PIN_SNAP_TOLERANCE, whichever is
+    larger), and the two pins must be different holes, as in the UI.
+
+    Args:
+        config: Configuration dictionary with pin1_x, pin1_y, pin2_x, pin2_y keys
+        holes: List of drill hole dicts with x, y, diameter
+
+    Returns:
+        Tuple of (first_pin, second_pin) dicts, or None if pin coordinates are missing
+        or don't match two distinct holes
+    """
+    pin_keys = ['pin1_x', 'pin1_y', 'pin2_x', 'pin2_y']
+    missing = [key for key in pin_keys if key not in config]
+    if missing:
+        print(f"Error: Missing pin coordinates in config: {', '.join(missing)}")
+        return None
+
+    if not holes:
+        print("Error: No drill holes to snap the configured pins to")
+        return None
+
+    pins = []
+    for n in (1, 2):
+        x = config[f'pin{n}_x']
+        y = config[f'pin{n}_y']
+        nearest = min(holes, key=lambda h: (h['x'] - x)**2 + (h['y'] - y)**2)
+        distance = ((nearest['x'] - x)**2 + (nearest['y'] - y)**2) ** 0.5
+        tolerance = max(nearest['diameter'] / 2, PIN_SNAP_TOLERANCE)
+        if distance > tolerance:
+            print(f"Error: No drill hole near pin {n} at ({x:.2f}, {y:.2f}) "
+                  f"(nearest is at ({nearest['x']:.2f}, {nearest['y']:.2f}), {distance:.2f}mm away)")
+            return None
+        pins.append(nearest)
+
+    if pins[0] is pins[1]:
+        print(f"Error: Pin 1 and pin 2 both snap to the hole at ({pins[0]['x']:.2f}, {pins[0]['y']:.2f})")
+        return None
+
+    return pins[0], pins[1]
+
+
 def extract_zip_to_temp(zip_path: Path) -> Path:
     """Extract ZIP archive to a temporary directory.
 
@@ -289,6 +340,11 @@ Examples:
         action="store_true",
         help="Force all trace centerlines without clipping to avoid filled zones (default: False)",
     )
+    fill_group.add_argument(
+        "--merge-paths",
+        action="store_true",
+        help="Join fill paths that share an endpoint to reduce laser on/off cycles (default: False)",
+    )
     fill_group.add_argument(
         "--bloom-compensation",
         action="store_true",
@@ -362,6 +418,11 @@ Examples:
         action="store_true",
         help="Flip board horizontally (mirror X axis) - typically used for bottom layer",
     )
+    gcode_group.add_argument(
+        "--no-path-comments",
+        action="store_true",
+        help="Don't write a '; Path i/N (length: ...)' comment before each path (smaller G-code file)",
+    )
 
     # Bed mesh calibration
     mesh_group = parser.add_argument_group('Bed mesh calibration')
@@ -545,6 +606,7 @@ Examples:
     force_trace_centerlines_max_thickness = get_value('force_trace_centerlines_max_thickness', default=0.0)
     double_expose_isolated = get_value('double_expose_isolated', default=False)
     isolation_threshold = get_value('isolation_threshold', default=3.0)
+    merge_paths = get_value('merge_paths', default=False)
 
     bloom_compensation = get_value('bloom_compensation', default=False)
     bloom_resolution = get_value('bloom_resolution', default=0.05)
@@ -575,6 +637,7 @@ Examples:
     pin_mode = get_value('pin_mode', default=False)
     pin_macro = get_value('pin_macro', default=False)
     flip_horizontal = get_value('flip_horizontal', default=False)
+    emit_path_comments = not get_value('no_path_comments', default=False)
 
     # Validate macro configuration
     if pin_macro and not pin_mode:
@@ -631,37 +694,49 @@ Examples:
 
         print(f"Found {len(pth_holes)} PTH holes and {len(npth_holes)} NPTH holes")
 
-        # Use board outline bounds if available (drill holes are positioned relative to board)
-        # Otherwise expand copper bounds to include all holes
-        if board_outline_bounds:
-            display_bounds = board_outline_bounds
-            print(f"Using board outline bounds for pin alignment display")
+        skip_pin_ui = os.environ.get('LASERRESIST_SKIP_PIN_UI', '').strip().lower() in ('1', 'true', 'yes', 'on')
+        if skip_pin_ui:
+            # Scripted/batch runs: take pin positions from config, never open the UI
+            print("LASERRESIST_SKIP_PIN_UI set - using pin positions from config")
+            selected = select_pins_from_config(config, pth_holes + npth_holes)
+
+            if selected is None:
+                print("Set pin1_x, pin1_y, pin2_x, pin2_y in the config file to two drill hole positions, or unset LASERRESIST_SKIP_PIN_UI.")
+                if temp_dir:
+                    shutil.rmtree(temp_dir, ignore_errors=True)
+                return 1
         else:
-            # Expand bounds to include all drill holes for visualization
-            # This ensures holes outside copper area are visible (e.g., bottom layer NPTH holes)
-            min_x, min_y, max_x, max_y = bounds
-            all_holes = pth_holes + npth_holes
-            if all_holes:
-                hole_xs = [h['x'] for h in all_holes]
-                hole_ys = [h['y'] for h in all_holes]
-                min_x = min(min_x, min(hole_xs))
-                min_y = min(min_y, min(hole_ys))
-                max_x = max(max_x, max(hole_xs))
-                max_y = max(max_y, max(hole_ys))
-                display_bounds = (min_x, min_y, max_x, max_y)
+            # Use board outline bounds if available (drill holes are positioned relative to board)
+            # Otherwise expand copper bounds to include all holes
+            if board_outline_bounds:
+                display_bounds = board_outline_bounds
+                print(f"Using board outline bounds for pin alignment display")
             else:
-                display_bounds = bounds
-            print(f"No board outline - using expanded copper bounds for pin alignment display")
-
-        # Show interactive UI (always need 2 pins for rotation detection)
-        ui = PinAlignmentUI()
-        selected = ui.show_board(geometry, display_bounds, pth_holes, npth_holes, trace_centerlines)
-
-        if selected is None:
-            print("\nPin alignment cancelled. Exiting.")
-            if temp_dir:
-                shutil.rmtree(temp_dir, ignore_errors=True)
-            return 0
+                # Expand bounds to include all drill holes for visualization
+                # This ensures holes outside copper area are visible (e.g., bottom layer NPTH holes)
+                min_x, min_y, max_x, max_y = bounds
+                all_holes = pth_holes + npth_holes
+                if all_holes:
+                    hole_xs = [h['x'] for h in all_holes]
+                    hole_ys = [h['y'] for h in all_holes]
+                    min_x = min(min_x, min(hole_xs))
+                    min_y = min(min_y, min(hole_ys))
+                    max_x = max(max_x, max(hole_xs))
+                    max_y = max(max_y, max(hole_ys))
+                    display_bounds = (min_x, min_y, max_x, max_y)
+                else:
+                    display_bounds = bounds
+                print(f"No board outline - using expanded copper bounds for pin alignment display")
+
+            # Show interactive UI (always need 2 pins for rotation detection)
+            ui = PinAlignmentUI()
+            selected = ui.show_board(geometry, display_bounds, pth_holes, npth_holes, trace_centerlines)
+
+            if selected is None:
+                print("\nPin alignment cancelled. Exiting.")
+                if temp_dir:
+                    shutil.rmtree(temp_dir, ignore_errors=True)
+                return 0
 
         # Both modes need 2 pins for rotation detection
         pin1, pin2 = selected
@@ -705,7 +780,7 @@ Examples:
     print(f"\nGenerating fill paths...")
     pads = parser_obj.get_pads()
     drill_holes = parser_obj.get_drill_holes()
-    fill_gen = FillGenerator(line_spacing=line_spacing, initial_offset=initial_offset, forced_pad_centerlines=forced_pad_centerlines, force_trace_centerlines=force_trace_centerlines, force_trace_centerlines_max_thickness=force_trace_centerlines_max_thickness, double_expose_isolated=double_expose_isolated, isolation_threshold=isolation_threshold)
+    fill_gen = FillGenerator(line_spacing=line_spacing, initial_offset=initial_offset, forced_pad_centerlines=forced_pad_centerlines, force_trace_centerlines=force_trace_centerlines, force_trace_centerlines_max_thickness=force_trace_centerlines_max_thickness, double_expose_isolated=double_expose_isolated, isolation_threshold=isolation_threshold, merge_paths=merge_paths)
     result = fill_gen.generate_fill(geometry, trace_centerlines=trace_centerlines, offset_centerlines=offset_centerlines, pads=pads, drill_holes=drill_holes)
 
     # Handle both list and dict return types
@@ -802,6 +877,7 @@ Examples:
         outline_offset_count=outline_offset_count,
         outline_offset_spacing=line_spacing,
         pin_transform=pin_transform,
+        emit_path_comments=emit_path_comments,
     )
 
     # Combine isolated paths and bloom compensation paths
@@ -809,7 +885,9 @@ Examples:
     if bloom_compensation_paths:
         double_expose_paths.extend(bloom_compensation_paths)
 
-    with open(output_file, 'w') as f:
+    # Large write buffer: G-code files are written in many small chunks and are
+    # often saved straight to slow media (USB sticks, network shares)
+    with open(output_file, 'w', buffering=256 * 1024) as f:
         gcode_gen.generate(paths, f, bounds, board_outline_bounds,
                          isolated_paths=double_expose_paths if double_expose_paths else None)
 
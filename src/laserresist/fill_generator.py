@@ -1,15 +1,17 @@
 """Fill pattern generation for laser exposure."""
 
 from typing import List, Union, Dict
-from shapely.geometry import MultiPolygon, Polygon, LineString, GeometryCollection, Point, MultiLineString
+import numpy as np
+import shapely
+from shapely.geometry import MultiPolygon, Polygon, LineString, Point
 from shapely import line_merge
-from shapely.ops import voronoi_diagram, linemerge, substring
+from shapely.ops import voronoi_diagram
 
 
 class FillGenerator:
     """Generate fill patterns for polygon areas."""
 
-    def __init__(self, line_spacing: float = 0.1, initial_offset: float = 0.05, forced_pad_centerlines: bool = False, force_trace_centerlines: bool = False, force_trace_centerlines_max_thickness: float = 0.0, double_expose_isolated: bool = False, isolation_threshold: float = 3.0):
+    def __init__(self, line_spacing: float = 0.1, initial_offset: float = 0.05, forced_pad_centerlines: bool = False, force_trace_centerlines: bool = False, force_trace_centerlines_max_thickness: float = 0.0, double_expose_isolated: bool = False, isolation_threshold: float = 3.0, merge_paths: bool = False):
         """Initialize the fill generator.
 
         Args:
@@ -21,6 +23,7 @@ class FillGenerator:
             force_trace_centerlines_max_thickness: Max thickness for forced trace centerlines. 0 = all traces, >0 = only traces <= this thickness (default: 0.0)
             double_expose_isolated: Enable double exposure for isolated features (default: False)
             isolation_threshold: Distance in mm - features with no copper within this radius are "isolated" (default: 3.0)
+            merge_paths: Join output paths that share an endpoint into single polylines, saving laser on/off cycles (default: False)
         """
         self.line_spacing = line_spacing
         self.initial_offset = initial_offset
@@ -29,6 +32,8 @@ class FillGenerator:
         self.force_trace_centerlines_max_thickness = force_trace_centerlines_max_thickness
         self.double_expose_isolated = double_expose_isolated
         self.isolation_threshold = isolation_threshold
+        self.merge_paths = merge_paths
+        self._unit_circles: Dict[int, np.ndarray] = {}  # num_points -> closed unit circle coords
 
     def generate_fill(self, geometry: Union[Polygon, MultiPolygon], trace_centerlines: List[dict] = None, offset_centerlines: bool = False, pads: List[dict] = None, drill_holes: Union[Polygon, MultiPolygon] = None) -> Union[List[LineString], Dict[str, List[LineString]]]:
         """Generate fill lines for the given geometry using contour offset method.
@@ -86,6 +91,7 @@ class FillGenerator:
 
         # Keep offsetting inward until nothing remains
         iteration = 0
+        current_area = self._get_total_area(current_geom)
         while not current_geom.is_empty:
             # For the first iteration, apply initial_offset inward to the boundaries
             # This compensates for laser dot size on the outer edges
@@ -102,8 +108,7 @@ class FillGenerator:
                 # Extract all boundaries from current geometry
                 boundary_paths = self._extract_boundaries(current_geom)
 
-            # Filter out degenerate geometries (points, very small fragments)
-            boundary_paths = [p for p in boundary_paths if p.length > 0.01]  # Min 0.01mm
+            # Degenerate rings (points, very small fragments) are already dropped
             paths.extend(boundary_paths)
             contour_paths.extend(boundary_paths)  # Track for centerline clipping
 
@@ -111,8 +116,8 @@ class FillGenerator:
             next_geom = self._buffer_incremental(current_geom, self.line_spacing)
 
             # If buffering made it disappear or very small, add centerlines for remaining area
-            current_area = self._get_total_area(current_geom)
-            next_area = self._get_total_area(next_geom)
+            # (the area of the previous step is carried over instead of being recomputed)
+            next_area = 0.0 if next_geom.is_empty else self._get_total_area(next_geom)
 
             if next_geom.is_empty or (current_area > 0 and next_area < current_area * 0.1):
                 # Save the remaining unfilled geometry before adding centerlines
@@ -120,7 +125,7 @@ class FillGenerator:
 
                 # Add centerlines for the remaining area (pads mostly)
                 centerlines = self._extract_centerlines(current_geom)
-                centerlines = [c for c in centerlines if c.length > 0.01]
+                centerlines = self._filter_min_length(centerlines).tolist()
                 if centerlines:
                     print(f"  Adding {len(centerlines)} pad centerlines (iteration {iteration})")
                 paths.extend(centerlines)
@@ -129,6 +134,7 @@ class FillGenerator:
 
             # Continue with the buffered geometry
             current_geom = next_geom
+            current_area = next_area
             iteration += 1
 
             # Safety limit to prevent infinite loops
@@ -149,24 +155,19 @@ class FillGenerator:
             if self.force_trace_centerlines:
                 # Force mode: add all trace centerlines without clipping
                 # Filter by thickness if max_thickness is set
-                filtered_centerlines = []
-                for tc_dict in trace_centerlines:
-                    line = tc_dict['line']
-                    width = tc_dict['width']
-                    # Apply thickness filter: 0 = all traces, >0 = only traces <= max_thickness
-                    if self.force_trace_centerlines_max_thickness <= 0 or width <= self.force_trace_centerlines_max_thickness:
-                        filtered_centerlines.append(line)
+                filtered_centerlines = np.array([tc_dict['line'] for tc_dict in trace_centerlines], dtype=object)
+                # Apply thickness filter: 0 = all traces, >0 = only traces <= max_thickness
+                if self.force_trace_centerlines_max_thickness > 0:
+                    widths = np.fromiter((tc_dict['width'] for tc_dict in trace_centerlines), dtype=np.float64, count=len(trace_centerlines))
+                    filtered_centerlines = filtered_centerlines[widths <= self.force_trace_centerlines_max_thickness]
 
                 # Optionally offset from ends if requested
                 if offset_centerlines:
-                    processed_centerlines = []
-                    for line in filtered_centerlines:
-                        trimmed = self._offset_line_from_ends(line, self.line_spacing)
-                        if trimmed and trimmed.length >= self.line_spacing * 2.5:
-                            processed_centerlines.append(trimmed)
+                    trimmed = self._offset_lines_from_ends(filtered_centerlines, self.line_spacing)
+                    processed_centerlines = trimmed[shapely.length(trimmed) >= self.line_spacing * 2.5].tolist()
                     offset_msg = " with end offsets"
                 else:
-                    processed_centerlines = [line for line in filtered_centerlines if line.length > 0.01]
+                    processed_centerlines = self._filter_min_length(filtered_centerlines).tolist()
                     offset_msg = ""
 
                 thickness_msg = f" (<= {self.force_trace_centerlines_max_thickness}mm)" if self.force_trace_centerlines_max_thickness > 0 else ""
@@ -201,16 +202,46 @@ class FillGenerator:
         if self.double_expose_isolated and self.isolation_threshold > 0:
             normal_paths, isolated_paths = self._separate_isolated_paths(paths, geometry)
             print(f"  Isolated feature detection: {len(isolated_paths)} isolated paths, {len(normal_paths)} normal paths")
+            if self.merge_paths:
+                normal_paths = self._merge_connected_paths(normal_paths)
+                isolated_paths = self._merge_connected_paths(isolated_paths)
             return {
                 'normal': normal_paths,
                 'isolated': isolated_paths
             }
         else:
+            if self.merge_paths:
+                paths = self._merge_connected_paths(paths)
             return paths
 
+    def _merge_connected_paths(self, paths: List[LineString]) -> List[LineString]:
+        """Join paths that share an endpoint into longer polylines.
+
+        Only exactly coincident endpoints are joined; paths are not split where they
+        cross, so every path is still traced exactly once. Merged paths may be
+        reversed and reordered.
+
+        Args:
+            paths: List of paths
+
+        Returns:
+            List of merged paths
+        """
+        if len(paths) < 2:
+            return paths
+
+        merged = line_merge(shapely.multilinestrings(paths))
+        merged_paths = list(shapely.get_parts(merged))
+        if len(merged_paths) < len(paths):
+            print(f"  Merged {len(paths)} paths into {len(merged_paths)} connected paths")
+        return merged_paths
+
     def _separate_isolated_paths(self, paths: List[LineString], full_geometry: Union[Polygon, MultiPolygon]) -> tuple:
         """Separate paths into normal and isolated based on proximity to other copper.
 
+        A path is considered isolated if the area around it (within isolation_threshold)
+        has low copper density, i.e. less than 20% of that area is copper.
+
         Args:
             paths: List of all paths
             full_geometry: The complete copper geometry
@@ -218,73 +249,75 @@ class FillGenerator:
         Returns:
             Tuple of (normal_paths, isolated_paths)
         """
-        normal_paths = []
-        isolated_paths = []
+        paths = np.asarray(paths, dtype=object)
+        if len(paths) == 0:
+            return [], []
 
-        for path in paths:
-            if self._is_path_isolated(path, full_geometry):
-                isolated_paths.append(path)
-            else:
-                normal_paths.append(path)
+        # Buffer every path by the isolation threshold to create the search zones
+        search_zones = shapely.buffer(paths, self.isolation_threshold, quad_segs=16)
+        zone_areas = shapely.area(search_zones)
 
-        return normal_paths, isolated_paths
+        # Find the copper polygons touching each search zone
+        copper_tree = shapely.STRtree(shapely.get_parts(full_geometry))
+        zone_index, copper_index = copper_tree.query(search_zones, predicate='intersects')
+        nearby = copper_tree.geometries.take(copper_index)
 
-    def _is_path_isolated(self, path: LineString, full_geometry: Union[Polygon, MultiPolygon]) -> bool:
-        """Check if a path is isolated (far from other copper).
+        # No copper nearby at all: isolated without measuring anything
+        has_copper = np.bincount(zone_index, minlength=len(paths)) > 0
 
-        A path is considered isolated if the area around it (within isolation_threshold)
-        has low copper density.
+        # Search zone lies entirely inside one copper polygon: not isolated
+        covered = np.zeros(len(paths), dtype=bool)
+        covered[zone_index[shapely.contains(nearby, search_zones[zone_index])]] = True
 
-        Args:
-            path: The path to check
-            full_geometry: The complete copper geometry
+        # Measure the copper area only for the remaining zones
+        measure = ~covered[zone_index]
+        overlap = shapely.intersection(nearby[measure], search_zones[zone_index[measure]])
+        copper_areas = np.bincount(zone_index[measure], weights=shapely.area(overlap), minlength=len(paths))
 
-        Returns:
-            True if path is isolated, False otherwise
-        """
-        # Buffer the path by the isolation threshold to create a search zone
-        search_zone = path.buffer(self.isolation_threshold)
+        # Consider isolated if copper density is low (< 20%)
+        # This means most of the area around the path is empty
+        with np.errstate(divide='ignore', invalid='ignore'):
+            isolated = (zone_areas > 0) & ~covered & (~has_copper | (copper_areas / zone_areas < 0.20))
 
-        # Find what portion of the search zone contains copper
-        copper_in_zone = search_zone.intersection(full_geometry)
+        return paths[~isolated].tolist(), paths[isolated].tolist()
 
-        # Calculate the copper density in the search zone
-        if search_zone.area > 0:
-            copper_density = copper_in_zone.area / search_zone.area
-            # Consider isolated if copper density is low (< 20%)
-            # This means most of the area around the path is empty
-            return copper_density < 0.20
+    @staticmethod
+    def _polygon_parts(geometry) -> np.ndarray:
+        """Get the individual polygons of a Polygon or MultiPolygon.
 
-        return False
+        Args:
+            geometry: Polygon or MultiPolygon (any other type yields no parts)
 
-    def _extract_boundaries(self, geometry: Union[Polygon, MultiPolygon]) -> List[LineString]:
+        Returns:
+            Numpy object array of Polygons
+        """
+        if shapely.get_type_id(geometry) in (3, 6):  # Polygon, MultiPolygon
+            return shapely.get_parts(geometry)
+        return np.empty(0, dtype=object)
+
+    def _extract_boundaries(self, geometry: Union[Polygon, MultiPolygon], min_length: float = 0.01) -> List[LineString]:
         """Extract all boundary lines from geometry.
 
         Args:
             geometry: Polygon or MultiPolygon
+            min_length: Rings not longer than this are dropped as degenerate (mm)
 
         Returns:
             List of LineString representing boundaries
         """
-        boundaries = []
-
-        # Handle MultiPolygon
-        if isinstance(geometry, MultiPolygon):
-            for poly in geometry.geoms:
-                boundaries.extend(self._extract_boundaries(poly))
-        # Handle Polygon
-        elif isinstance(geometry, Polygon):
-            # Add exterior boundary
-            if geometry.exterior:
-                boundaries.append(LineString(geometry.exterior.coords))
+        polygons = self._polygon_parts(geometry)
 
-            # Add interior boundaries (holes)
-            for interior in geometry.interiors:
-                boundaries.append(LineString(interior.coords))
+        # Collect exterior + interior rings of every polygon (in order), drop the
+        # degenerate ones, then build all boundary LineStrings with a single batched call
+        rings = shapely.get_rings(polygons)
+        rings = rings[shapely.length(rings) > min_length]
+        if len(rings) == 0:
+            return []
 
-        return boundaries
+        coords, ring_index = shapely.get_coordinates(rings, return_index=True)
+        return list(shapely.linestrings(coords, indices=ring_index))
 
-    def _buffer_incremental(self, geometry: Union[Polygon, MultiPolygon], distance: float) -> Union[Polygon, MultiPolygon, GeometryCollection]:
+    def _buffer_incremental(self, geometry: Union[Polygon, MultiPolygon], distance: float) -> Union[Polygon, MultiPolygon]:
         """Buffer geometry inward by a negative offset incrementally.
 
         Args:
@@ -292,7 +325,7 @@ class FillGenerator:
             distance: Distance to offset inward (e.g., 0.1mm)
 
         Returns:
-            Buffered geometry (may be empty, split, or merged)
+            Polygon or MultiPolygon (may be empty, split, or merged)
         """
         # Negative buffer = inward offset from CURRENT geometry
         buffered = geometry.buffer(-distance)
@@ -301,14 +334,14 @@ class FillGenerator:
         if buffered.is_empty:
             return MultiPolygon()
 
-        # Normalize to MultiPolygon for consistency
-        if isinstance(buffered, Polygon):
-            return MultiPolygon([buffered])
-        elif isinstance(buffered, MultiPolygon):
+        # Polygons and MultiPolygons are used as GEOS returned them
+        type_id = shapely.get_type_id(buffered)
+        if type_id in (3, 6):  # Polygon, MultiPolygon
             return buffered
-        elif isinstance(buffered, GeometryCollection):
+        elif type_id == 7:  # GeometryCollection
             # Extract only polygons from collection
-            polys = [geom for geom in buffered.geoms if isinstance(geom, Polygon)]
+            parts = shapely.get_parts(buffered)
+            polys = parts[shapely.get_type_id(parts) == 3].tolist()
             return MultiPolygon(polys) if polys else MultiPolygon()
         else:
             return MultiPolygon()
@@ -323,35 +356,46 @@ class FillGenerator:
         Returns:
             True if any polygon is thinner than threshold
         """
-        polygons = []
-        if isinstance(geometry, MultiPolygon):
-            polygons = list(geometry.geoms)
-        elif isinstance(geometry, Polygon):
-            polygons = [geometry]
+        polygons = self._polygon_parts(geometry)
+        if len(polygons) == 0:
+            return False
 
-        for poly in polygons:
-            try:
-                # Get minimum rotated rectangle
-                min_rect = poly.minimum_rotated_rectangle
-                coords = list(min_rect.exterior.coords)
-
-                if len(coords) >= 5:
-                    # Calculate side lengths
-                    p0, p1, p2 = coords[0], coords[1], coords[2]
-                    d01 = ((p1[0] - p0[0])**2 + (p1[1] - p0[1])**2)**0.5
-                    d12 = ((p2[0] - p1[0])**2 + (p2[1] - p1[1])**2)**0.5
-
-                    # Minimum of the two sides is the width
-                    width = min(d01, d12)
-
-                    # If width is less than threshold, it's too thin
-                    if width < threshold:
-                        return True
-            except Exception:
-                # If we can't determine, assume it's not too thin
-                pass
+        try:
+            # If any width is less than threshold, it's too thin
+            widths, _, _ = self._compute_mrr_widths(polygons)
+            return bool(np.any(widths < threshold))
+        except Exception:
+            # If we can't determine, assume it's not too thin
+            return False
+
+    def _compute_mrr_widths(self, polygons: np.ndarray) -> tuple:
+        """Measure polygons by their minimum rotated rectangles in one batched pass.
+
+        Args:
+            polygons: Array of Polygons
+
+        Returns:
+            Tuple of (widths, mid1, mid2) arrays: the short side length of each rectangle
+            and the midpoints of its two short sides (the ends of its centerline)
+        """
+        min_rects = shapely.minimum_rotated_rectangle(polygons)
+        rings = shapely.get_exterior_ring(min_rects[shapely.get_type_id(min_rects) == 3])
+        counts = shapely.get_num_coordinates(rings)
+        starts = (np.cumsum(counts) - counts)[counts >= 5]  # Rectangle has 5 points (first == last)
+        coords = shapely.get_coordinates(rings)
+        p0, p1, p2, p3 = coords[starts], coords[starts + 1], coords[starts + 2], coords[starts + 3]
 
-        return False
+        # Calculate side lengths
+        d01 = np.sqrt(((p1 - p0)**2).sum(axis=1))
+        d12 = np.sqrt(((p2 - p1)**2).sum(axis=1))
+
+        # Find midpoints of the SHORT sides (perpendicular to the trace direction)
+        # d01 long: p1-p2 and p3-p0 are the short sides; otherwise p0-p1 and p2-p3
+        long01 = (d01 > d12)[:, None]
+        mid1 = np.where(long01, (p1 + p2) / 2, (p0 + p1) / 2)
+        mid2 = np.where(long01, (p3 + p0) / 2, (p2 + p3) / 2)
+
+        return np.minimum(d01, d12), mid1, mid2
 
     def _get_total_area(self, geometry: Union[Polygon, MultiPolygon]) -> float:
         """Get total area of geometry.
@@ -362,12 +406,8 @@ class FillGenerator:
         Returns:
             Total area in mm²
         """
-        if isinstance(geometry, MultiPolygon):
-            return sum(poly.area for poly in geometry.geoms)
-        elif isinstance(geometry, Polygon):
-            return geometry.area
-        else:
-            return 0.0
+        # GEOS sums the parts of a MultiPolygon in a single call
+        return float(shapely.area(geometry))
 
     def _extract_centerlines(self, geometry: Union[Polygon, MultiPolygon]) -> List[LineString]:
         """Extract centerlines from thin/small geometries.
@@ -381,48 +421,55 @@ class FillGenerator:
         Returns:
             List of centerline paths
         """
-        centerlines = []
+        # Handle MultiPolygon / Polygon
+        polygons = self._polygon_parts(geometry)
+        if len(polygons) == 0:
+            return []
 
-        # Handle MultiPolygon
-        if isinstance(geometry, MultiPolygon):
-            for poly in geometry.geoms:
-                centerlines.extend(self._extract_centerlines(poly))
-        # Handle Polygon
-        elif isinstance(geometry, Polygon):
-            # Use minimum rotated rectangle to find centerline
-            try:
-                min_rect = geometry.minimum_rotated_rectangle  # Fixed: was 'poly', should be 'geometry'
-                coords = list(min_rect.exterior.coords)
-
-                if len(coords) >= 5:  # Rectangle has 5 points (first == last)
-                    p0, p1, p2, p3 = coords[0], coords[1], coords[2], coords[3]
-
-                    # Calculate side lengths
-                    d01 = ((p1[0] - p0[0])**2 + (p1[1] - p0[1])**2)**0.5
-                    d12 = ((p2[0] - p1[0])**2 + (p2[1] - p1[1])**2)**0.5
-
-                    # Find midpoints of the SHORT sides (perpendicular to the trace direction)
-                    # The centerline connects these midpoints
-                    if d01 > d12:  # d01 is long side, d12 is short side
-                        # p1-p2 and p3-p0 are the short sides
-                        mid1 = ((p1[0] + p2[0]) / 2, (p1[1] + p2[1]) / 2)
-                        mid2 = ((p3[0] + p0[0]) / 2, (p3[1] + p0[1]) / 2)
-                    else:  # d12 is long side, d01 is short side
-                        # p0-p1 and p2-p3 are the short sides
-                        mid1 = ((p0[0] + p1[0]) / 2, (p0[1] + p1[1]) / 2)
-                        mid2 = ((p2[0] + p3[0]) / 2, (p2[1] + p3[1]) / 2)
-
-                    # Create centerline
-                    centerline = LineString([mid1, mid2])
-                    if centerline.length > 0.01:  # Minimum useful length
-                        centerlines.append(centerline)
-
-            except Exception as e:
-                # If we can't create a centerline, skip it
-                print(f"Warning: centerline extraction failed: {e}")
-                pass
+        # Use minimum rotated rectangle to find centerline, computed for all polygons in one call
+        try:
+            # The centerline connects the midpoints of the short sides
+            _, mid1, mid2 = self._compute_mrr_widths(polygons)
 
-        return centerlines
+            # Create centerlines
+            centerlines = shapely.linestrings(np.stack([mid1, mid2], axis=1))
+            return self._filter_min_length(centerlines).tolist()  # Minimum useful length
+
+        except Exception as e:
+            # If we can't create centerlines, skip them
+            print(f"Warning: centerline extraction failed: {e}")
+            return []
+
+    @staticmethod
+    def _filter_min_length(paths: List[LineString], min_length: float = 0.01) -> np.ndarray:
+        """Drop paths that are not longer than min_length, in one vectorized pass.
+
+        Args:
+            paths: List or array of paths
+            min_length: Minimum length in mm (paths must be strictly longer)
+
+        Returns:
+            Array of the remaining paths, in input order
+        """
+        paths = np.asarray(paths, dtype=object)
+        return paths[shapely.length(paths) > min_length]
+
+    @staticmethod
+    def _flatten_lines(geometries: np.ndarray) -> np.ndarray:
+        """Explode geometries into their non-empty LineStrings.
+
+        MultiLineStrings and GeometryCollections (including one level of nested
+        multi-part geometries) are split into parts; points and polygons are dropped.
+
+        Args:
+            geometries: Array of geometries (e.g. intersection results)
+
+        Returns:
+            Array of LineStrings in input order
+        """
+        lines = shapely.get_parts(shapely.get_parts(geometries))
+        keep = (shapely.get_type_id(lines) == 1) & ~shapely.is_empty(lines)  # LineString
+        return lines[keep]
 
     def _clip_centerlines_to_geometry(self, centerlines: List[LineString], geometry: Union[Polygon, MultiPolygon]) -> List[LineString]:
         """Clip centerlines to only the parts within the geometry.
@@ -436,37 +483,49 @@ class FillGenerator:
         Returns:
             List of clipped centerlines
         """
-        clipped = []
+        lines = np.asarray(centerlines, dtype=object)
+        if len(lines) == 0:
+            return []
 
-        for line in centerlines:
-            try:
-                # Intersect the line with the geometry
-                intersection = line.intersection(geometry)
+        try:
+            # Intersect only the lines that touch the geometry
+            segments = self._intersect_lines(lines, geometry)
+        except Exception:
+            # If batch clipping fails, clip line by line and skip the failing centerlines
+            clipped = []
+            for line in lines:
+                try:
+                    clipped.append(line.intersection(geometry))
+                except Exception:
+                    pass
 
-                # Handle different result types
-                if intersection.is_empty:
-                    continue
-                elif isinstance(intersection, LineString):
-                    if intersection.length > 0.01:  # Min length threshold
-                        clipped.append(intersection)
-                elif isinstance(intersection, MultiLineString):
-                    for segment in intersection.geoms:
-                        if segment.length > 0.01:
-                            clipped.append(segment)
-                elif isinstance(intersection, GeometryCollection):
-                    # Extract only LineStrings from the collection
-                    for geom in intersection.geoms:
-                        if isinstance(geom, LineString) and geom.length > 0.01:
-                            clipped.append(geom)
-                        elif isinstance(geom, MultiLineString):
-                            for segment in geom.geoms:
-                                if segment.length > 0.01:
-                                    clipped.append(segment)
-            except Exception as e:
-                # If clipping fails, skip this centerline
-                pass
+            # Explode MultiLineStrings/GeometryCollections and keep only LineStrings, preserving order
+            segments = self._flatten_lines(np.asarray(clipped, dtype=object))
+
+        # Drop tiny fragments in one vectorized length pass (min length threshold)
+        return self._filter_min_length(segments).tolist()
+
+    def _intersect_lines(self, lines: np.ndarray, geometry: Union[Polygon, MultiPolygon]) -> np.ndarray:
+        """Intersect lines with a geometry, skipping lines that touch none of its parts.
 
-        return clipped
+        An STRtree over the polygons of the geometry finds the lines that touch it;
+        only those are intersected, each with the whole geometry so that the
+        segments match a per-line line.intersection(geometry) exactly (intersecting
+        with a subset of the parts nodes and rounds differently). Segments come out
+        ordered by input line, then by position along the line.
+
+        Args:
+            lines: Array of LineStrings
+            geometry: Polygon or MultiPolygon to clip to
+
+        Returns:
+            Array of clipped LineStrings
+        """
+        line_index = np.unique(shapely.STRtree(shapely.get_parts(geometry)).query(lines, predicate='intersects')[0])
+        intersections = shapely.intersection(lines[line_index], geometry)
+
+        # Explode MultiLineStrings/GeometryCollections
+        return self._flatten_lines(intersections)
 
     def _clip_centerlines_to_unfilled(self, centerlines: List[LineString], geometry: Union[Polygon, MultiPolygon], filled_area: Union[Polygon, MultiPolygon]) -> List[LineString]:
         """Clip centerlines to only unfilled areas (areas without contour coverage).
@@ -510,20 +569,16 @@ class FillGenerator:
             return MultiPolygon()
 
         try:
-            # Buffer each contour path to represent laser coverage area
-            buffered = []
-            for path in contour_paths:
-                if path.length > 0.01:  # Skip very short paths
-                    buf = path.buffer(buffer_distance, cap_style='round', join_style='round')
-                    if not buf.is_empty:
-                        buffered.append(buf)
-
-            if not buffered:
+            # Buffer every contour path in one call to represent laser coverage area
+            paths = self._filter_min_length(contour_paths)  # Skip very short paths
+            buffered = shapely.buffer(paths, buffer_distance, quad_segs=16, cap_style='round', join_style='round')
+            buffered = buffered[~shapely.is_empty(buffered)]
+
+            if len(buffered) == 0:
                 return MultiPolygon()
 
             # Union all buffered areas
-            from shapely.ops import unary_union
-            filled_zone = unary_union(buffered)
+            filled_zone = shapely.union_all(buffered)
 
             return filled_zone
 
@@ -556,86 +611,109 @@ class FillGenerator:
         # Set minimum length threshold based on whether we're offsetting
         min_length_threshold = self.line_spacing * 2.5 if offset_ends else 0.01
 
-        for line in centerlines:
-            try:
-                # Calculate the unfilled corridor where the centerline should go
-                # This is the original geometry minus the filled zones
-                unfilled_corridor = original_geometry.difference(filled_zone)
+        lines = np.asarray(centerlines, dtype=object)
+        if len(lines) == 0:
+            return clipped
 
-                if unfilled_corridor.is_empty:
-                    continue
+        try:
+            # Calculate the unfilled corridor where the centerlines should go
+            # This is the original geometry minus the filled zones (same for every line)
+            unfilled_corridor = original_geometry.difference(filled_zone)
 
-                # Intersect the centerline with the unfilled corridor
-                intersection = line.intersection(unfilled_corridor)
+            if unfilled_corridor.is_empty:
+                return clipped
 
-                # Collect segments to process
-                segments = []
-                if intersection.is_empty:
-                    continue
-                elif isinstance(intersection, LineString):
-                    segments.append(intersection)
-                elif isinstance(intersection, MultiLineString):
-                    segments.extend(intersection.geoms)
-                elif isinstance(intersection, GeometryCollection):
-                    # Extract only LineStrings from the collection
-                    for geom in intersection.geoms:
-                        if isinstance(geom, LineString):
-                            segments.append(geom)
-                        elif isinstance(geom, MultiLineString):
-                            segments.extend(geom.geoms)
-
-                # Process each segment: optionally offset from both ends and check length
-                for segment in segments:
-                    if offset_ends:
-                        trimmed = self._offset_line_from_ends(segment, self.line_spacing)
-                        if trimmed and trimmed.length >= min_length_threshold:
-                            clipped.append(trimmed)
-                    else:
-                        # No offsetting, just check minimum length
-                        if segment.length >= min_length_threshold:
-                            clipped.append(segment)
+            # The corridor is made of many small pieces; skip the centerlines that touch none of them
+            segments = self._intersect_lines(lines, unfilled_corridor)
+        except Exception as e:
+            # If clipping fails, skip the centerlines
+            print(f"Warning: Failed to clip centerlines: {e}")
+            return clipped
 
-            except Exception as e:
-                # If clipping fails, skip this centerline
-                print(f"Warning: Failed to clip centerline: {e}")
-                pass
+        # Process all segments: optionally offset from both ends, then check length
+        if offset_ends:
+            segments = self._offset_lines_from_ends(segments, self.line_spacing)
 
-        return clipped
+        return segments[shapely.length(segments) >= min_length_threshold].tolist()
 
-    def _offset_line_from_ends(self, line: LineString, offset: float) -> LineString:
-        """Offset a line from both ends by the specified distance.
+    def _offset_lines_from_ends(self, lines: List[LineString], offset: float) -> np.ndarray:
+        """Offset lines from both ends by the specified distance.
 
         Args:
-            line: Original LineString
+            lines: Original LineStrings
             offset: Distance to trim from each end
 
         Returns:
-            Trimmed LineString, or None if the line is too short
+            Array of trimmed LineStrings (lines too short to offset are dropped)
         """
+        lines = np.asarray(lines, dtype=object)
+
         try:
-            total_length = line.length
+            total_lengths = shapely.length(lines)
+
+            # If line is too short to offset, drop it
+            keep = total_lengths > offset * 2
+            lines, total_lengths = lines[keep], total_lengths[keep]
+            if len(lines) == 0:
+                return lines
+
+            # Get points at offset distance from start and end of every line
+            start_dists = np.full(len(lines), float(offset))
+            end_dists = total_lengths - offset
+            start_points = shapely.get_coordinates(shapely.line_interpolate_point(lines, start_dists))
+            end_points = shapely.get_coordinates(shapely.line_interpolate_point(lines, end_dists))
+
+            # Keep the original vertices that lie strictly between the two points
+            coords, line_index = shapely.get_coordinates(lines, return_index=True)
+            cumulative = np.concatenate(([0.0], np.cumsum(np.sqrt(((coords[1:] - coords[:-1])**2).sum(axis=1)))))
+            vertex_dists = cumulative - cumulative[np.searchsorted(line_index, line_index)]
+            interior = (vertex_dists > start_dists[line_index]) & (vertex_dists < end_dists[line_index])
+
+            # Create new lines from start point, interior vertices and end point
+            line_ids = np.arange(len(lines))
+            xy = np.concatenate((start_points, coords[interior], end_points))
+            index = np.concatenate((line_ids, line_index[interior], line_ids))
+            rank = np.repeat([0, 1, 2], [len(lines), interior.sum(), len(lines)])
+            order = np.lexsort((rank, index))
+
+            return shapely.linestrings(xy[order], indices=index[order])
 
-            # If line is too short to offset, return None
-            if total_length <= offset * 2:
-                return None
+        except Exception:
+            # If offsetting fails, drop the lines
+            return np.empty(0, dtype=object)
 
-            # Get points at offset distance from start and end
-            start_point = line.interpolate(offset)
-            end_point = line.interpolate(total_length - offset)
+    def _unit_circle(self, num_points: int) -> np.ndarray:
+        """Get a closed unit circle polyline, cached per point count.
 
-            # Create new line from trimmed points
-            # We need to extract the subsegment between these two points
-            start_dist = offset
-            end_dist = total_length - offset
+        Circle sizes repeat across pads of the same footprint, so the cos/sin
+        table is computed once per num_points and reused.
 
-            # Create a substring of the line
-            trimmed_line = substring(line, start_dist, end_dist)
+        Args:
+            num_points: Number of segments in the circle
 
-            return trimmed_line
+        Returns:
+            (num_points + 1, 2) array of unit circle coordinates (first == last)
+        """
+        circle = self._unit_circles.get(num_points)
+        if circle is None:
+            angles = 2 * np.pi * np.arange(num_points + 1) / num_points  # +1 to close the circle
+            circle = np.column_stack((np.cos(angles), np.sin(angles)))
+            self._unit_circles[num_points] = circle
+        return circle
 
-        except Exception as e:
-            # If offsetting fails, return None
-            return None
+    def _circle_coords(self, cx: float, cy: float, radius: float) -> np.ndarray:
+        """Get a closed circle polyline with vertices about line_spacing/2 apart.
+
+        Args:
+            cx: Circle center X
+            cy: Circle center Y
+            radius: Circle radius
+
+        Returns:
+            (N, 2) array of circle coordinates (first == last), at least 16 segments
+        """
+        num_points = max(16, int(2 * np.pi * radius / (self.line_spacing / 2)))
+        return (cx, cy) + radius * self._unit_circle(num_points)
 
     def _detect_thin_annular_pads_at_start(self, geometry: Union[Polygon, MultiPolygon]) -> List[LineString]:
         """Detect thin annular pads from the ORIGINAL geometry and generate circular centerlines.
@@ -649,52 +727,37 @@ class FillGenerator:
         Returns:
             List of circular centerlines for thin rings
         """
-        from shapely.geometry import Point
-        from math import pi, cos, sin
-
         rings = []
 
-        # Normalize to list of polygons
-        polys = list(geometry.geoms) if hasattr(geometry, 'geoms') else [geometry]
-
-        for poly in polys:
-            if not isinstance(poly, Polygon):
-                continue
-
-            # MUST have interior ring (hole)
-            if len(poly.interiors) == 0:
-                continue
-
-            # Get bounds to check if it's small and circular
-            bounds = poly.bounds
-            width = bounds[2] - bounds[0]
-            height = bounds[3] - bounds[1]
-
-            # Skip large pads - only look at small ones
-            pad_size = max(width, height)
-            if pad_size > 4.0:  # Skip pads larger than 4mm
-                continue
-
-            # Must be circular (very strict check)
-            aspect_ratio = max(width, height) / (min(width, height) + 0.001)
-            if aspect_ratio > 1.15:  # Very strict - must be nearly circular
-                continue
-
+        # Normalize to array of polygons
+        polys = shapely.get_parts(geometry)
+        polys = polys[shapely.get_type_id(polys) == 3]
+
+        # Screen all polygons at once; candidates:
+        # - MUST have interior ring (hole)
+        # - Skip large pads - only look at small ones (pads larger than 4mm)
+        # - Must be circular (very strict check)
+        bounds = shapely.bounds(polys)
+        width = bounds[:, 2] - bounds[:, 0]
+        height = bounds[:, 3] - bounds[:, 1]
+        pad_size = np.maximum(width, height)
+        aspect_ratio = pad_size / (np.minimum(width, height) + 0.001)
+        candidates = (shapely.get_num_interior_rings(polys) > 0) & (pad_size <= 4.0) & (aspect_ratio <= 1.15)
+
+        for poly in polys[candidates]:
             # Get the exterior and first interior ring
             exterior = poly.exterior
             interior = poly.interiors[0]
 
             centroid = poly.centroid
+            cx, cy = centroid.x, centroid.y
 
             # Calculate average radius from centroid to exterior and interior
-            ext_coords = list(exterior.coords)
-            int_coords = list(interior.coords)
-
-            outer_distances = [Point(x, y).distance(centroid) for x, y in ext_coords]
-            inner_distances = [Point(x, y).distance(centroid) for x, y in int_coords]
+            ext_coords = shapely.get_coordinates(exterior)
+            int_coords = shapely.get_coordinates(interior)
 
-            outer_radius = sum(outer_distances) / len(outer_distances)
-            inner_radius = sum(inner_distances) / len(inner_distances)
+            outer_radius = np.sqrt((ext_coords[:, 0] - cx)**2 + (ext_coords[:, 1] - cy)**2).mean()
+            inner_radius = np.sqrt((int_coords[:, 0] - cx)**2 + (int_coords[:, 1] - cy)**2).mean()
 
             # Calculate ring width (annular pad width)
             ring_width = outer_radius - inner_radius
@@ -707,23 +770,15 @@ class FillGenerator:
             # Generate a circular centerline at the midpoint radius
             mid_radius = (outer_radius + inner_radius) / 2.0
 
-            # Create smooth circle
-            num_points = max(16, int(2 * pi * mid_radius / (self.line_spacing / 2)))
-            coords = []
-            for i in range(num_points + 1):  # +1 to close the circle
-                angle = 2 * pi * i / num_points
-                x = centroid.x + mid_radius * cos(angle)
-                y = centroid.y + mid_radius * sin(angle)
-                coords.append((x, y))
+            # Create smooth circle (coordinates only, the LineStrings are built after the loop)
+            rings.append(self._circle_coords(cx, cy, mid_radius))
 
-            if len(coords) >= 2:
-                try:
-                    ring_centerline = LineString(coords)
-                    rings.append(ring_centerline)
-                except:
-                    pass
+        if not rings:
+            return []
 
-        return rings
+        # Build all ring centerlines in one call
+        ring_index = np.repeat(np.arange(len(rings)), [len(coords) for coords in rings])
+        return list(shapely.linestrings(np.concatenate(rings), indices=ring_index))
 
     def _generate_forced_pad_centerlines(self, pads: List[dict], drill_holes: Union[Polygon, MultiPolygon, None], existing_thin_rings: List[LineString]) -> List[LineString]:
         """Generate forced centerlines for all pads using actual pad info from Gerber.
@@ -736,48 +791,60 @@ class FillGenerator:
         Returns:
             List of LineString centerlines for pads
         """
-        from shapely.geometry import Point, MultiLineString
-        from math import pi, cos, sin
+        from shapely.geometry import MultiLineString
 
         if not pads:
             return []
 
         centerlines = []
 
-        # Track which pads already have thin ring circles to avoid duplicates
-        existing_ring_centroids = []
+        # Track which pads already have thin ring circles to avoid duplicates,
+        # bucketed on a 0.1mm grid so each pad only checks the rings in neighbouring cells
+        existing_ring_centroids = {}
         if existing_thin_rings:
             for ring in existing_thin_rings:
-                coords = list(ring.coords)
-                if coords:
-                    center_x = sum(x for x, y in coords) / len(coords)
-                    center_y = sum(y for x, y in coords) / len(coords)
-                    existing_ring_centroids.append((center_x, center_y))
-
+                coords = shapely.get_coordinates(ring)
+                if len(coords):
+                    center_x, center_y = coords.mean(axis=0).tolist()
+                    cell = (round(center_x * 10), round(center_y * 10))
+                    existing_ring_centroids.setdefault(cell, []).append((center_x, center_y))
+
+        # Drop pads that already have a thin ring circle
+        kept_pads = []
         for pad in pads:
-            aperture_type = pad['aperture_type']
             position = pad['position']
 
             # Check if duplicate (already has thin ring)
             is_duplicate = False
-            for ex_x, ex_y in existing_ring_centroids:
-                if abs(position[0] - ex_x) < 0.1 and abs(position[1] - ex_y) < 0.1:
-                    is_duplicate = True
-                    break
+            if existing_ring_centroids:
+                cell_x, cell_y = round(position[0] * 10), round(position[1] * 10)
+                is_duplicate = any(
+                    abs(position[0] - ex_x) < 0.1 and abs(position[1] - ex_y) < 0.1
+                    for dx in (-1, 0, 1) for dy in (-1, 0, 1)
+                    for ex_x, ex_y in existing_ring_centroids.get((cell_x + dx, cell_y + dy), ())
+                )
 
             if is_duplicate:
                 continue
 
-            # Start with the original pad geometry
-            poly = pad['geometry']
+            kept_pads.append(pad)
+
+        # Start with the original pad geometries
+        pad_polys = np.array([pad['geometry'] for pad in kept_pads], dtype=object)
 
-            # Subtract any drill holes that intersect this pad
-            if drill_holes and not drill_holes.is_empty:
-                poly = poly.difference(drill_holes)
+        # Subtract any drill holes that intersect the pads; an STRtree over the holes
+        # finds the pads that actually touch one, the others are left as they are
+        if drill_holes and not drill_holes.is_empty:
+            hole_tree = shapely.STRtree(shapely.get_parts(drill_holes))
+            touched = np.unique(hole_tree.query(pad_polys, predicate='intersects')[0])
+            pad_polys[touched] = shapely.difference(pad_polys[touched], drill_holes)
 
-            # Apply initial offset inward (same as for outer contours)
-            if self.initial_offset > 0:
-                poly = poly.buffer(-self.initial_offset)
+        # Apply initial offset inward (same as for outer contours), to all pads in one call
+        if self.initial_offset > 0:
+            pad_polys = shapely.buffer(pad_polys, -self.initial_offset, quad_segs=16)
+
+        for pad, poly in zip(kept_pads, pad_polys):
+            aperture_type = pad['aperture_type']
 
             # Handle case where operations return GeometryCollection, MultiPolygon, or empty
             if poly.is_empty:
@@ -794,7 +861,8 @@ class FillGenerator:
 
             has_hole = len(poly.interiors) > 0
             centroid = poly.centroid
-            bounds = poly.bounds
+            cx, cy = centroid.x, centroid.y
+            min_x, min_y, max_x, max_y = poly.bounds
 
             if aperture_type == 'circle':
                 if has_hole:
@@ -802,66 +870,40 @@ class FillGenerator:
                     exterior = poly.exterior
                     interior = poly.interiors[0]
 
-                    ext_coords = list(exterior.coords)
-                    int_coords = list(interior.coords)
+                    ext_coords = shapely.get_coordinates(exterior)
+                    int_coords = shapely.get_coordinates(interior)
 
-                    outer_distances = [Point(x, y).distance(centroid) for x, y in ext_coords]
-                    inner_distances = [Point(x, y).distance(centroid) for x, y in int_coords]
-
-                    outer_radius = sum(outer_distances) / len(outer_distances)
-                    inner_radius = sum(inner_distances) / len(inner_distances)
+                    outer_radius = np.sqrt((ext_coords[:, 0] - cx)**2 + (ext_coords[:, 1] - cy)**2).mean()
+                    inner_radius = np.sqrt((int_coords[:, 0] - cx)**2 + (int_coords[:, 1] - cy)**2).mean()
 
                     mid_radius = (outer_radius + inner_radius) / 2.0
 
                     # Generate circle
-                    num_points = max(16, int(2 * pi * mid_radius / (self.line_spacing / 2)))
-                    coords = []
-                    for i in range(num_points + 1):
-                        angle = 2 * pi * i / num_points
-                        x = centroid.x + mid_radius * cos(angle)
-                        y = centroid.y + mid_radius * sin(angle)
-                        coords.append((x, y))
-
-                    if len(coords) >= 2:
-                        try:
-                            centerlines.append(LineString(coords))
-                        except:
-                            pass
+                    centerlines.append(LineString(self._circle_coords(cx, cy, mid_radius)))
                 else:
                     # Circular pad without hole - add circle at radius/2
-                    exterior_coords = list(poly.exterior.coords)
-                    distances = [Point(x, y).distance(centroid) for x, y in exterior_coords]
-                    radius = sum(distances) / len(distances)
+                    exterior_coords = shapely.get_coordinates(poly.exterior)
+                    radius = np.sqrt((exterior_coords[:, 0] - cx)**2 + (exterior_coords[:, 1] - cy)**2).mean()
 
                     circle_radius = radius / 2.0
 
-                    num_points = max(16, int(2 * pi * circle_radius / (self.line_spacing / 2)))
-                    coords = []
-                    for i in range(num_points + 1):
-                        angle = 2 * pi * i / num_points
-                        x = centroid.x + circle_radius * cos(angle)
-                        y = centroid.y + circle_radius * sin(angle)
-                        coords.append((x, y))
-
-                    if len(coords) >= 2:
-                        try:
-                            centerlines.append(LineString(coords))
-                        except:
-                            pass
+                    centerlines.append(LineString(self._circle_coords(cx, cy, circle_radius)))
 
             elif aperture_type == 'rectangle':
                 # Rectangular pad - add AXIS-ALIGNED + from center
                 try:
-                    cx, cy = centroid.x, centroid.y
-
                     # Horizontal line through center
-                    h_line = LineString([(bounds[0], cy), (bounds[2], cy)])
+                    h_line = LineString([(min_x, cy), (max_x, cy)])
                     # Vertical line through center
-                    v_line = LineString([(cx, bounds[1]), (cx, bounds[3])])
+                    v_line = LineString([(cx, min_y), (cx, max_y)])
 
-                    # Clip to actual pad geometry (handles holes)
-                    h_clipped = h_line.intersection(poly)
-                    v_clipped = v_line.intersection(poly)
+                    if not has_hole and self._is_axis_aligned_rectangle(poly):
+                        # Both lines lie entirely inside the pad, nothing to clip
+                        h_clipped, v_clipped = h_line, v_line
+                    else:
+                        # Clip to actual pad geometry (handles holes)
+                        h_clipped = h_line.intersection(poly)
+                        v_clipped = v_line.intersection(poly)
 
                     # Add valid segments
                     for clipped in [h_clipped, v_clipped]:
@@ -879,6 +921,23 @@ class FillGenerator:
 
         return centerlines
 
+    @staticmethod
+    def _is_axis_aligned_rectangle(poly: Polygon) -> bool:
+        """Check if a polygon is exactly its own axis-aligned bounding box.
+
+        Args:
+            poly: Polygon to check
+
+        Returns:
+            True if the exterior is 4 distinct bounding box corners (and nothing else)
+        """
+        coords = shapely.get_coordinates(poly.exterior)
+        if len(coords) != 5:
+            return False
+        min_x, min_y, max_x, max_y = poly.bounds
+        on_corners = np.isin(coords[:, 0], (min_x, max_x)) & np.isin(coords[:, 1], (min_y, max_y))
+        return bool(on_corners.all()) and len(np.unique(coords[:4], axis=0)) == 4
+
     def _detect_tiny_junction_polygons(self, geometry: Union[Polygon, MultiPolygon]) -> List[LineString]:
         """Detect and fill ONLY very small polygons at multi-trace junctions.
 
@@ -891,9 +950,6 @@ class FillGenerator:
         Returns:
             List of fill paths for tiny junction polygons
         """
-        from shapely.geometry import Point
-        from math import pi, cos, sin
-
         junction_fills = []
 
         # Normalize to list of polygons
@@ -908,9 +964,9 @@ class FillGenerator:
                 continue
 
             # Get polygon characteristics
-            bounds = poly.bounds
-            width = bounds[2] - bounds[0]
-            height = bounds[3] - bounds[1]
+            min_x, min_y, max_x, max_y = poly.bounds
+            width = max_x - min_x
+            height = max_y - min_y
             area = poly.area
 
             # Calculate hole areas
@@ -951,33 +1007,9 @@ class FillGenerator:
             max_iterations = 20  # Safety limit for small polygons
 
             while not current.is_empty and iteration < max_iterations:
-                # Extract boundaries
+                # Extract boundaries (exterior and holes of every part, degenerate rings dropped)
                 try:
-                    if isinstance(current, Polygon):
-                        # Add exterior boundary
-                        if current.exterior and len(current.exterior.coords) >= 3:
-                            boundary = LineString(current.exterior.coords)
-                            if boundary.length > 0.01:
-                                junction_fills.append(boundary)
-
-                        # Add interior boundaries (holes)
-                        for interior in current.interiors:
-                            if len(interior.coords) >= 3:
-                                boundary = LineString(interior.coords)
-                                if boundary.length > 0.01:
-                                    junction_fills.append(boundary)
-
-                    elif isinstance(current, MultiPolygon):
-                        for p in current.geoms:
-                            if p.exterior and len(p.exterior.coords) >= 3:
-                                boundary = LineString(p.exterior.coords)
-                                if boundary.length > 0.01:
-                                    junction_fills.append(boundary)
-                            for interior in p.interiors:
-                                if len(interior.coords) >= 3:
-                                    boundary = LineString(interior.coords)
-                                    if boundary.length > 0.01:
-                                        junction_fills.append(boundary)
+                    junction_fills.extend(self._extract_boundaries(current))
 
                     # Buffer inward
                     next_current = current.buffer(-self.line_spacing)
@@ -985,27 +1017,8 @@ class FillGenerator:
                     # Check if we should stop
                     if next_current.is_empty:
                         # Add centerline for remaining area
-                        try:
-                            min_rect = current.minimum_rotated_rectangle if isinstance(current, Polygon) else current
-                            if isinstance(min_rect, Polygon):
-                                coords = list(min_rect.exterior.coords)
-                                if len(coords) >= 5:
-                                    p0, p1, p2, p3 = coords[0], coords[1], coords[2], coords[3]
-                                    d01 = ((p1[0] - p0[0])**2 + (p1[1] - p0[1])**2)**0.5
-                                    d12 = ((p2[0] - p1[0])**2 + (p2[1] - p1[1])**2)**0.5
-
-                                    if d01 > d12:
-                                        mid1 = ((p1[0] + p2[0]) / 2, (p1[1] + p2[1]) / 2)
-                                        mid2 = ((p3[0] + p0[0]) / 2, (p3[1] + p0[1]) / 2)
-                                    else:
-                                        mid1 = ((p0[0] + p1[0]) / 2, (p0[1] + p1[1]) / 2)
-                                        mid2 = ((p2[0] + p3[0]) / 2, (p2[1] + p3[1]) / 2)
-
-                                    centerline = LineString([mid1, mid2])
-                                    if centerline.length > 0.01:
-                                        junction_fills.append(centerline)
-                        except:
-                            pass
+                        if isinstance(current, Polygon):
+                            junction_fills.extend(self._extract_centerlines(current))
                         break
 
                     current = next_current
@@ -1016,6 +1029,26 @@ class FillGenerator:
 
         return junction_fills
 
+    @staticmethod
+    def _scan_positions(start: float, stop: float, step: float) -> np.ndarray:
+        """Get scanline positions from start up to and including stop.
+
+        Positions are accumulated step by step (like ``pos += step``) rather than
+        computed as ``start + i * step``, so they match an incremental scan exactly.
+
+        Args:
+            start: First position
+            stop: Last allowed position
+            step: Distance between positions
+
+        Returns:
+            Array of positions <= stop
+        """
+        steps = np.full(int((stop - start) / step) + 2, float(step))
+        steps[0] = start
+        positions = np.cumsum(steps)
+        return positions[positions <= stop]
+
     def _generate_crosshatch_fill(self, geometry: Union[Polygon, MultiPolygon], spacing: float) -> List[LineString]:
         """Generate dense crosshatch pattern for small remaining areas.
 
@@ -1041,40 +1074,85 @@ class FillGenerator:
             bounds = poly.bounds
             min_x, min_y, max_x, max_y = bounds
 
-            # Generate horizontal lines
-            y = min_y
-            while y <= max_y:
-                line = LineString([(min_x - spacing, y), (max_x + spacing, y)])
-                # Clip to polygon
-                try:
-                    clipped = line.intersection(poly)
-                    if not clipped.is_empty:
-                        if isinstance(clipped, LineString) and clipped.length > 0.01:
-                            fills.append(clipped)
-                        elif isinstance(clipped, MultiLineString):
-                            fills.extend([seg for seg in clipped.geoms if seg.length > 0.01])
-                except:
-                    pass
-                y += spacing
-
-            # Generate vertical lines
-            x = min_x
-            while x <= max_x:
-                line = LineString([(x, min_y - spacing), (x, max_y + spacing)])
-                # Clip to polygon
-                try:
-                    clipped = line.intersection(poly)
-                    if not clipped.is_empty:
-                        if isinstance(clipped, LineString) and clipped.length > 0.01:
-                            fills.append(clipped)
-                        elif isinstance(clipped, MultiLineString):
-                            fills.extend([seg for seg in clipped.geoms if seg.length > 0.01])
-                except:
-                    pass
-                x += spacing
+            # Horizontal and vertical scanlines, all clipped to the polygon in one call
+            ys = self._scan_positions(min_y, max_y, spacing)
+            xs = self._scan_positions(min_x, max_x, spacing)
+            h_lines = shapely.linestrings(np.stack([
+                np.column_stack((np.full(len(ys), min_x - spacing), ys)),
+                np.column_stack((np.full(len(ys), max_x + spacing), ys)),
+            ], axis=1))
+            v_lines = shapely.linestrings(np.stack([
+                np.column_stack((xs, np.full(len(xs), min_y - spacing))),
+                np.column_stack((xs, np.full(len(xs), max_y + spacing))),
+            ], axis=1))
+
+            lines = np.concatenate((h_lines, v_lines))
+            try:
+                clipped = shapely.intersection(lines, poly)
+            except Exception:
+                # If batch clipping fails, clip line by line and skip the failing scanlines
+                clipped = []
+                for line in lines:
+                    try:
+                        clipped.append(line.intersection(poly))
+                    except Exception:
+                        pass
+                clipped = np.asarray(clipped, dtype=object)
+
+            # Only (Multi)LineString results count; touching points are ignored
+            clipped = clipped[np.isin(shapely.get_type_id(clipped), (1, 5))]
+            fills.extend(self._filter_min_length(self._flatten_lines(clipped)).tolist())
 
         return fills
 
+    @staticmethod
+    def _cluster_points(points: np.ndarray, eps: float) -> np.ndarray:
+        """Group points into clusters of neighbours chained within eps of each other.
+
+        Points are bucketed into a grid of eps-sized cells, so each point only
+        needs to be compared against the points in its own and the 8 adjacent cells.
+        Clusters are labelled in order of their first point.
+
+        Args:
+            points: (N, 2) array of point coordinates
+            eps: Maximum distance between neighbouring points in a cluster
+
+        Returns:
+            Array of N cluster labels
+        """
+        from collections import defaultdict
+
+        cells = np.floor(points / eps).astype(np.int64)
+        buckets = defaultdict(list)
+        for i, cell in enumerate(map(tuple, cells.tolist())):
+            buckets[cell].append(i)
+        buckets = {cell: np.array(members) for cell, members in buckets.items()}
+
+        labels = np.full(len(points), -1)
+        next_label = 0
+        for seed in range(len(points)):
+            if labels[seed] >= 0:
+                continue
+
+            # Flood-fill the cluster from this point
+            labels[seed] = next_label
+            stack = [seed]
+            while stack:
+                i = stack.pop()
+                cell_x, cell_y = cells[i]
+                for dx in (-1, 0, 1):
+                    for dy in (-1, 0, 1):
+                        members = buckets.get((cell_x + dx, cell_y + dy))
+                        if members is None:
+                            continue
+                        members = members[labels[members] < 0]
+                        near = members[np.hypot(*(points[members] - points[i]).T) <= eps]
+                        labels[near] = next_label
+                        stack.extend(near.tolist())
+            next_label += 1
+
+        return labels
+
     def _detect_and_fill_gaps(self, geometry: Union[Polygon, MultiPolygon], existing_fills: List[LineString]) -> List[LineString]:
         """Detect unfilled gaps in copper and add targeted fills.
 
@@ -1088,7 +1166,7 @@ class FillGenerator:
         Returns:
             List of gap fill paths
         """
-        from shapely.geometry import Point, box
+        from shapely.geometry import box
         from shapely.ops import unary_union
 
         gap_fills = []
@@ -1100,7 +1178,8 @@ class FillGenerator:
         sample_spacing = self.line_spacing * 1.5  # Sample every 1.5x line spacing
         gap_threshold = self.line_spacing * 0.6  # Gap if > 60% of line spacing from fill
 
-        gap_points = []
+        # Collect the sample points that lie in copper
+        sample_points = []
 
         for poly in polys:
             if not isinstance(poly, Polygon) or poly.is_empty:
@@ -1109,35 +1188,33 @@ class FillGenerator:
             bounds = poly.bounds
             min_x, min_y, max_x, max_y = bounds
 
-            # Sample points in a grid
-            y = min_y
-            while y <= max_y:
-                x = min_x
-                while x <= max_x:
-                    point = Point(x, y)
-
-                    # Check if point is in copper
-                    if poly.contains(point):
-                        # Check distance to nearest fill (optimized - only check nearby fills)
-                        min_dist = float('inf')
-                        search_box = box(x - gap_threshold*2, y - gap_threshold*2,
-                                       x + gap_threshold*2, y + gap_threshold*2)
-
-                        for fill in existing_fills:
-                            # Skip fills that are obviously too far
-                            if fill.intersects(search_box):
-                                dist = point.distance(fill)
-                                if dist < min_dist:
-                                    min_dist = dist
-                                if dist < gap_threshold:  # Early exit if close enough
-                                    break
-
-                        # If too far from any fill, this is a gap
-                        if min_dist > gap_threshold:
-                            gap_points.append((x, y, min_dist))
-
-                    x += sample_spacing
-                y += sample_spacing
+            # Sample points in a grid, row by row
+            grid_x, grid_y = np.meshgrid(self._scan_positions(min_x, max_x, sample_spacing),
+                                         self._scan_positions(min_y, max_y, sample_spacing))
+            grid_x, grid_y = grid_x.ravel(), grid_y.ravel()
+
+            # Check which points are in copper (prepared, so the polygon edges are indexed once)
+            shapely.prepare(poly)
+            in_copper = shapely.contains_xy(poly, grid_x, grid_y)
+            sample_points.append(np.column_stack((grid_x[in_copper], grid_y[in_copper])))
+
+        sample_xy = np.concatenate(sample_points) if sample_points else np.empty((0, 2))
+        if len(sample_xy) == 0:
+            return []
+
+        # Distance from every sample point to its nearest fill, looked up in an STRtree.
+        # Only fills within the 2*gap_threshold search radius matter; anything farther is a gap anyway
+        min_dists = np.full(len(sample_xy), np.inf)
+        if existing_fills:
+            fill_tree = shapely.STRtree(existing_fills)
+            (point_index, _), dists = fill_tree.query_nearest(
+                shapely.points(sample_xy), max_distance=gap_threshold * 2, return_distance=True
+            )
+            np.minimum.at(min_dists, point_index, dists)
+
+        # If too far from any fill, this is a gap
+        is_gap = min_dists > gap_threshold
+        gap_points = [(x, y, d) for (x, y), d in zip(sample_xy[is_gap].tolist(), min_dists[is_gap].tolist())]
 
         if not gap_points:
             return []
@@ -1145,62 +1222,36 @@ class FillGenerator:
         print(f"    Detected {len(gap_points)} gap sample points")
 
         # Group nearby gap points into clusters
-        from sklearn.cluster import DBSCAN
-        import numpy as np
-
-        try:
-            # Cluster gap points
-            points_array = np.array([(x, y) for x, y, _ in gap_points])
-            clustering = DBSCAN(eps=self.line_spacing * 2, min_samples=1).fit(points_array)
+        points_array = np.array([(x, y) for x, y, _ in gap_points])
+        labels = self._cluster_points(points_array, self.line_spacing * 2)
 
-            # Generate fills for each cluster
-            for cluster_id in set(clustering.labels_):
-                cluster_points = points_array[clustering.labels_ == cluster_id]
+        # Generate fills for each cluster
+        for cluster_id in set(labels):
+            cluster_points = points_array[labels == cluster_id]
 
-                if len(cluster_points) < 2:
-                    continue
+            if len(cluster_points) < 2:
+                continue
 
-                # Get bounds of cluster
-                cluster_min_x = cluster_points[:, 0].min()
-                cluster_max_x = cluster_points[:, 0].max()
-                cluster_min_y = cluster_points[:, 1].min()
-                cluster_max_y = cluster_points[:, 1].max()
-
-                # Create a small fill area for this cluster
-                cluster_box = box(cluster_min_x - self.line_spacing,
-                                cluster_min_y - self.line_spacing,
-                                cluster_max_x + self.line_spacing,
-                                cluster_max_y + self.line_spacing)
-
-                # Find the copper polygon this cluster belongs to
-                for poly in polys:
-                    if poly.intersects(cluster_box):
-                        # Generate dense crosshatch for this specific area
-                        cluster_geom = poly.intersection(cluster_box)
-                        if not cluster_geom.is_empty:
-                            cluster_fills = self._generate_crosshatch_fill(cluster_geom, self.line_spacing * 0.6)
-                            gap_fills.extend(cluster_fills)
-                            break
-
-        except ImportError:
-            # sklearn not available, fall back to simpler approach
-            # Just add a line through each gap point
-            for x, y, _ in gap_points[:20]:  # Limit to 20 points
-                # Add a small cross at each gap point
-                for poly in polys:
-                    point = Point(x, y)
-                    if poly.contains(point):
-                        # Horizontal line
-                        h_line = LineString([(x - self.line_spacing*0.5, y),
-                                            (x + self.line_spacing*0.5, y)])
-                        # Vertical line
-                        v_line = LineString([(x, y - self.line_spacing*0.5),
-                                            (x, y + self.line_spacing*0.5)])
-
-                        for line in [h_line, v_line]:
-                            clipped = line.intersection(poly)
-                            if isinstance(clipped, LineString) and clipped.length > 0.01:
-                                gap_fills.append(clipped)
+            # Get bounds of cluster
+            cluster_min_x = cluster_points[:, 0].min()
+            cluster_max_x = cluster_points[:, 0].max()
+            cluster_min_y = cluster_points[:, 1].min()
+            cluster_max_y = cluster_points[:, 1].max()
+
+            # Create a small fill area for this cluster
+            cluster_box = box(cluster_min_x - self.line_spacing,
+                            cluster_min_y - self.line_spacing,
+                            cluster_max_x + self.line_spacing,
+                            cluster_max_y + self.line_spacing)
+
+            # Find the copper polygon this cluster belongs to
+            for poly in polys:
+                if poly.intersects(cluster_box):
+                    # Generate dense crosshatch for this specific area
+                    cluster_geom = poly.intersection(cluster_box)
+                    if not cluster_geom.is_empty:
+                        cluster_fills = self._generate_crosshatch_fill(cluster_geom, self.line_spacing * 0.6)
+                        gap_fills.extend(cluster_fills)
                         break
 
         return gap_fills
@@ -1,6 +1,8 @@
 """G-code generation from fill patterns."""
 
 from typing import List, TextIO, Optional
+import numpy as np
+import shapely
 from shapely.geometry import LineString
 
 
@@ -27,6 +29,7 @@ class GCodeGenerator:
         outline_offset_count: int = 0,
         outline_offset_spacing: float = 0.1,
         pin_transform: Optional[dict] = None,
+        emit_path_comments: bool = True,
     ):
         """Initialize the G-code generator.
 
@@ -49,6 +52,7 @@ class GCodeGenerator:
             outline_offset_count: Number of offset copies: 0=single outline, -1=one outward copy, +1=one inward copy, etc.
             outline_offset_spacing: Spacing between offset copies in mm, default 0.1
             pin_transform: Optional pin alignment transformation dict with keys: rotate_180, translate_x, translate_y, origin_x, origin_y
+            emit_path_comments: If True, write a "; Path i/N (length: ...)" comment before each path, default True
         """
         self.laser_power = laser_power
         self.feed_rate = feed_rate
@@ -68,10 +72,16 @@ class GCodeGenerator:
         self.outline_offset_count = outline_offset_count
         self.outline_offset_spacing = outline_offset_spacing
         self.pin_transform = pin_transform
+        self.emit_path_comments = emit_path_comments
 
         # Calculate S parameter for M3 command (0-255 scale)
         self.laser_s_value = int((laser_power / 100.0) * laser_max_power)
 
+        # Constant G-code lines, formatted once and reused for every path
+        self._m3_line = f"M3 S{self.laser_s_value}  ; Laser on\n"
+        self._m5_line = "M5  ; Laser off\n"
+        self._g1_feed_line = f"G1 F{self.feed_rate}  ; Set exposure speed\n"
+
     def generate(self, paths: List[LineString], output_file: TextIO, bounds: tuple = None, board_outline_bounds: tuple = None, isolated_paths: List[LineString] = None):
         """Generate G-code from fill paths.
 
@@ -90,11 +100,7 @@ class GCodeGenerator:
             min_x, min_y, max_x, max_y = bounds
         else:
             # Calculate bounds from paths if not provided
-            all_coords = [coord for path in paths for coord in path.coords]
-            min_x = min(x for x, y in all_coords)
-            min_y = min(y for x, y in all_coords)
-            max_x = max(x for x, y in all_coords)
-            max_y = max(y for x, y in all_coords)
+            min_x, min_y, max_x, max_y = shapely.total_bounds(paths).tolist()
             bounds = (min_x, min_y, max_x, max_y)
 
         # Use board outline for normalization if provided, otherwise use copper bounds
@@ -345,7 +351,7 @@ class GCodeGenerator:
             paths: List of paths to trace
         """
         f.write("; Begin laser exposure\n")
-        f.write(f"G1 F{self.feed_rate}  ; Set exposure speed\n")
+        f.write(self._g1_feed_line)
         f.write("M73 P0 R{:.0f}  ; Progress 0%, estimated time remaining\n\n".format(self.time_estimate_minutes))
 
         total_paths = len(paths)
@@ -354,39 +360,33 @@ class GCodeGenerator:
         m73_interval = 3.0 / 60.0  # 3 seconds in minutes (respects Klipper 5s timeout)
         prev_end_pos = None  # Track previous path end position for travel distance
 
-        for i, path in enumerate(paths):
-            coords = list(path.coords)
+        # Transform the coordinates of all paths in one pass (flip, rotate, translate)
+        path_coords, path_moves = self._path_coordinates(paths)
+        path_lengths = shapely.length(paths).tolist()
+
+        for i, (path_length, coords, moves) in enumerate(zip(path_lengths, path_coords, path_moves)):
             if len(coords) < 2:
                 continue  # Skip degenerate paths
 
+            parts = []  # All G-code for this path, written with a single call
+
             # Emit M73 if we've accumulated 3+ seconds since last update, or first/last path
             time_since_last_m73 = cumulative_time - last_m73_time
             if time_since_last_m73 >= m73_interval or i == 0 or i == total_paths - 1:
                 current_progress_percent = min(100.0, (cumulative_time / self.time_estimate_minutes) * 100.0)
                 remaining_minutes = max(0, self.time_estimate_minutes - cumulative_time)
-                f.write(f"M73 P{current_progress_percent:.1f} R{int(remaining_minutes)}  ; Progress {current_progress_percent:.1f}%\n")
+                parts.append(f"M73 P{current_progress_percent:.1f} R{int(remaining_minutes)}  ; Progress {current_progress_percent:.1f}%\n")
                 last_m73_time = cumulative_time
 
-            # Comment with path info
-            f.write(f"; Path {i+1}/{total_paths} (length: {path.length:.2f}mm)\n")
+            # Comment with path info (optional, keeps the output smaller when disabled)
+            if self.emit_path_comments:
+                parts.append(f"; Path {i+1}/{total_paths} (length: {path_length:.2f}mm)\n")
 
-            # Apply coordinate transformation (flip, rotate, translate)
-            start_x, start_y = coords[0]
-
-            # Step 1: Flip horizontal if enabled (mirror X around center)
+            # Start position (flipped if enabled) for the travel distance
+            start_x, start_y = coords[0].tolist()
             if self.flip_horizontal:
                 start_x = 2 * self.flip_center_x - start_x
-
-            # Step 2: Rotate 180° if enabled (pin alignment)
-            if self.rotate_180:
-                # Rotate 180° around center point, then translate
-                cx, cy = self.rotation_center_x, self.rotation_center_y
-                start_x_transformed = 2*cx - start_x + self.transform_x
-                start_y_transformed = 2*cy - start_y + self.transform_y
-            else:
-                # Step 3: Just translate
-                start_x_transformed = start_x + self.transform_x
-                start_y_transformed = start_y + self.transform_y
+            start_x_transformed, start_y_transformed = moves[0].tolist()
 
             # Add travel time if not first path
             if prev_end_pos is not None:
@@ -397,38 +397,21 @@ class GCodeGenerator:
                 cumulative_time += travel_time
 
             # Rapid to start position with laser off
-            f.write(f"G0 X{start_x_transformed:.4f} Y{start_y_transformed:.4f}  ; Move to start\n")
-
-            # Turn laser on
-            f.write(f"M3 S{self.laser_s_value}  ; Laser on\n")
+            parts.append(f"G0 X{start_x_transformed:.4f} Y{start_y_transformed:.4f}  ; Move to start\n")
 
             # Update cumulative time with path exposure time
-            path_time = path.length / self.feed_rate
+            path_time = path_length / self.feed_rate
             cumulative_time += path_time
 
-            # Trace the path with transformed coordinates
-            for x, y in coords[1:]:
-                # Step 1: Flip horizontal if enabled (mirror X around center)
-                if self.flip_horizontal:
-                    x = 2 * self.flip_center_x - x
-
-                # Step 2: Rotate 180° if enabled (pin alignment)
-                if self.rotate_180:
-                    cx, cy = self.rotation_center_x, self.rotation_center_y
-                    x_transformed = 2*cx - x + self.transform_x
-                    y_transformed = 2*cy - y + self.transform_y
-                else:
-                    # Step 3: Just translate
-                    x_transformed = x + self.transform_x
-                    y_transformed = y + self.transform_y
-                f.write(f"G1 X{x_transformed:.4f} Y{y_transformed:.4f}\n")
-
-            # Turn laser off
-            f.write("M5  ; Laser off\n")
-            f.write("\n")
+            # Turn laser on, trace the path with transformed coordinates, turn laser off
+            parts.append(self._m3_line)
+            parts.extend(self._format_moves(moves[1:]))
+            parts.append(self._m5_line)
+            parts.append("\n")
+            f.write("".join(parts))
 
             # Store end position for next travel calculation
-            prev_end_pos = coords[-1]
+            prev_end_pos = coords[-1].tolist()
 
         # Write second pass for isolated features if provided
         if self.isolated_paths and len(self.isolated_paths) > 0:
@@ -441,11 +424,14 @@ class GCodeGenerator:
             f.write("G1 F{:.1f}  ; Set exposure speed\n".format(self.feed_rate))
 
             total_isolated = len(self.isolated_paths)
-            for i, path in enumerate(self.isolated_paths):
-                coords = list(path.coords)
+            isolated_coords, isolated_moves = self._path_coordinates(self.isolated_paths)
+            isolated_lengths = shapely.length(self.isolated_paths).tolist()
+            for i, (path_length, coords, moves) in enumerate(zip(isolated_lengths, isolated_coords, isolated_moves)):
                 if len(coords) < 2:
                     continue
 
+                parts = []  # All G-code for this path, written with a single call
+
                 # Update progress for isolated paths
                 isolated_progress = ((total_paths + i) / (total_paths + total_isolated)) * 100.0
                 isolated_remaining = max(0, self.time_estimate_minutes - cumulative_time)
@@ -453,22 +439,17 @@ class GCodeGenerator:
                 # Emit M73 for progress tracking
                 time_since_last_m73 = cumulative_time - last_m73_time
                 if time_since_last_m73 >= m73_interval or i == 0 or i == total_isolated - 1:
-                    f.write(f"M73 P{isolated_progress:.1f} R{int(isolated_remaining)}  ; Isolated pass progress {isolated_progress:.1f}%\n")
+                    parts.append(f"M73 P{isolated_progress:.1f} R{int(isolated_remaining)}  ; Isolated pass progress {isolated_progress:.1f}%\n")
                     last_m73_time = cumulative_time
 
-                f.write(f"; Isolated path {i+1}/{total_isolated} (length: {path.length:.2f}mm)\n")
+                if self.emit_path_comments:
+                    parts.append(f"; Isolated path {i+1}/{total_isolated} (length: {path_length:.2f}mm)\n")
 
-                # Transform start position
-                start_x, start_y = coords[0]
+                # Start position (flipped if enabled) for the travel distance
+                start_x, start_y = coords[0].tolist()
                 if self.flip_horizontal:
                     start_x = 2 * self.flip_center_x - start_x
-                if self.rotate_180:
-                    cx, cy = self.rotation_center_x, self.rotation_center_y
-                    start_x_transformed = 2*cx - start_x + self.transform_x
-                    start_y_transformed = 2*cy - start_y + self.transform_y
-                else:
-                    start_x_transformed = start_x + self.transform_x
-                    start_y_transformed = start_y + self.transform_y
+                start_x_transformed, start_y_transformed = moves[0].tolist()
 
                 # Add travel time
                 if prev_end_pos is not None:
@@ -478,29 +459,62 @@ class GCodeGenerator:
                     travel_time = travel_distance / self.travel_rate
                     cumulative_time += travel_time
 
-                f.write(f"G0 X{start_x_transformed:.4f} Y{start_y_transformed:.4f}  ; Move to start\n")
-                f.write(f"M3 S{self.laser_s_value}  ; Laser on\n")
-
                 # Update cumulative time
-                path_time = path.length / self.feed_rate
+                path_time = path_length / self.feed_rate
                 cumulative_time += path_time
 
-                # Trace the path
-                for x, y in coords[1:]:
-                    if self.flip_horizontal:
-                        x = 2 * self.flip_center_x - x
-                    if self.rotate_180:
-                        cx, cy = self.rotation_center_x, self.rotation_center_y
-                        x_transformed = 2*cx - x + self.transform_x
-                        y_transformed = 2*cy - y + self.transform_y
-                    else:
-                        x_transformed = x + self.transform_x
-                        y_transformed = y + self.transform_y
-                    f.write(f"G1 X{x_transformed:.4f} Y{y_transformed:.4f}\n")
-
-                f.write("M5  ; Laser off\n")
-                f.write("\n")
-                prev_end_pos = coords[-1]
+                parts.append(f"G0 X{start_x_transformed:.4f} Y{start_y_transformed:.4f}  ; Move to start\n")
+                parts.append(self._m3_line)
+                parts.extend(self._format_moves(moves[1:]))
+                parts.append(self._m5_line)
+                parts.append("\n")
+                f.write("".join(parts))
+                prev_end_pos = coords[-1].tolist()
+
+    def _path_coordinates(self, paths: List[LineString]) -> tuple:
+        """Get the original and transformed coordinates of every path.
+
+        The transformation (flip, rotate, translate) is applied to the coordinates
+        of all paths at once with numpy, then split back per path.
+
+        Args:
+            paths: List of paths
+
+        Returns:
+            Tuple of (original, transformed) lists of (N, 2) coordinate arrays, one per path
+        """
+        coords, path_index = shapely.get_coordinates(paths, return_index=True)
+        splits = np.cumsum(np.bincount(path_index, minlength=len(paths)))[:-1]
+        x, y = coords[:, 0], coords[:, 1]
+
+        # Step 1: Flip horizontal if enabled (mirror X around center)
+        if self.flip_horizontal:
+            x = 2 * self.flip_center_x - x
+
+        # Step 2: Rotate 180° if enabled (pin alignment), then translate
+        if self.rotate_180:
+            cx, cy = self.rotation_center_x, self.rotation_center_y
+            x = 2*cx - x + self.transform_x
+            y = 2*cy - y + self.transform_y
+        else:
+            # Step 3: Just translate
+            x = x + self.transform_x
+            y = y + self.transform_y
+
+        return np.split(coords, splits), np.split(np.column_stack((x, y)), splits)
+
+    @staticmethod
+    def _format_moves(moves: np.ndarray) -> List[str]:
+        """Format laser-on G1 moves.
+
+        Args:
+            moves: (N, 2) array of already transformed coordinates
+
+        Returns:
+            List of G1 lines, one per coordinate
+        """
+        # %-formatting with a fixed spec, bound once and mapped over (x, y) tuples
+        return list(map("G1 X%.4f Y%.4f\n".__mod__, zip(moves[:, 0].tolist(), moves[:, 1].tolist())))
 
     def _write_bed_mesh_calibration(self, f: TextIO, board_outline_bounds: tuple, use_macro: bool = False,
                                     probe_to_nozzle: str = None, nozzle_to_probe: str = None):
@@ -642,14 +656,16 @@ class GCodeGenerator:
             else:
                 f.write(f"; Offset copy {i} ({abs(offset_amount):.2f}mm {offset_dir})\n")
 
-            f.write(f"G0 X{corner_x1:.4f} Y{corner_y1:.4f}  ; Move to corner 1\n")
-            f.write(f"M3 S{self.laser_s_value}  ; Laser on\n")
-            f.write(f"G1 X{corner_x2:.4f} Y{corner_y1:.4f}  ; Draw to corner 2\n")
-            f.write(f"G1 X{corner_x2:.4f} Y{corner_y2:.4f}  ; Draw to corner 3\n")
-            f.write(f"G1 X{corner_x1:.4f} Y{corner_y2:.4f}  ; Draw to corner 4\n")
-            f.write(f"G1 X{corner_x1:.4f} Y{corner_y1:.4f}  ; Draw back to corner 1\n")
-            f.write("M5  ; Laser off\n")
-            f.write("\n")
+            f.write(
+                f"G0 X{corner_x1:.4f} Y{corner_y1:.4f}  ; Move to corner 1\n"
+                + self._m3_line +
+                f"G1 X{corner_x2:.4f} Y{corner_y1:.4f}  ; Draw to corner 2\n"
+                f"G1 X{corner_x2:.4f} Y{corner_y2:.4f}  ; Draw to corner 3\n"
+                f"G1 X{corner_x1:.4f} Y{corner_y2:.4f}  ; Draw to corner 4\n"
+                f"G1 X{corner_x1:.4f} Y{corner_y1:.4f}  ; Draw back to corner 1\n"
+                + self._m5_line +
+                "\n"
+            )
 
         f.write("\n")
 
@@ -666,7 +682,7 @@ class GCodeGenerator:
             return 0.0
 
         # Calculate exposure time (path lengths at feed rate)
-        total_exposure_length = sum(path.length for path in paths)
+        total_exposure_length = sum(shapely.length(paths).tolist())
         exposure_time_minutes = total_exposure_length / self.feed_rate
 
         # Estimate travel distance (between paths)
@@ -2,9 +2,6 @@
 
 from typing import List, Dict, Tuple, Optional, Union
 from shapely.geometry import Polygon, MultiPolygon, LineString
-import matplotlib.pyplot as plt
-from matplotlib.patches import Circle as MPLCircle, Polygon as MPLPolygon
-from matplotlib.widgets import Button
 import numpy as np
 
 
@@ -19,6 +16,7 @@ class PinAlignmentUI:
         self.cancelled = False
         self.confirmed = False
 
+        self.plt = None  # matplotlib.pyplot, set when the UI is shown
         self.fig = None
         self.ax = None
         self.text_status = None
@@ -51,6 +49,11 @@ class PinAlignmentUI:
         print("  2. Click second hole (top pin on laser table) - will turn blue")
         print("  3. Click 'Confirm' or 'Cancel' button")
 
+        # matplotlib is only imported once the UI is actually shown, so scripted
+        # runs that never open the window don't pay for the GUI stack
+        import matplotlib.pyplot as plt
+        from matplotlib.widgets import Button
+
         # Combine all holes with type info
         self.all_holes = []
         for hole in pth_holes:
@@ -59,6 +62,7 @@ class PinAlignmentUI:
             self.all_holes.append({**hole, 'type': 'npth'})
 
         # Create matplotlib figure
+        self.plt = plt
         self.fig, self.ax = plt.subplots(figsize=(14, 10))
         self.fig.canvas.manager.set_window_title('Pin Alignment - LaserResist')
 
@@ -141,6 +145,8 @@ class PinAlignmentUI:
 
     def _plot_copper(self, geometry: Union[Polygon, MultiPolygon]):
         """Plot copper geometry."""
+        from matplotlib.patches import Polygon as MPLPolygon
+
         polygons = []
         if isinstance(geometry, Polygon):
             polygons = [geometry]
@@ -176,6 +182,8 @@ class PinAlignmentUI:
 
     def _plot_holes(self):
         """Plot all drill holes."""
+        from matplotlib.patches import Circle as MPLCircle
+
         for i, hole in enumerate(self.all_holes):
             x, y = hole['x'], hole['y']
             radius = hole['diameter'] / 2
@@ -306,14 +314,14 @@ class PinAlignmentUI:
         self.confirmed = True
         self.cancelled = False
 
-        plt.close(self.fig)
+        self.plt.close(self.fig)
 
     def _on_cancel(self, event):
         """Handle cancel button click."""
         self.cancelled = True
         self.confirmed = False
         self.selected_pins = None
-        plt.close(self.fig)
+        self.plt.close(self.fig)
 
 def get_pin_alignment_transform(pin1: Dict, pin2: Dict) -> Dict[str, float]:
     """Calculate coordinate transformation from pin alignment.
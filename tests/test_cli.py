@@ -0,0 +1,48 @@
+"""Tests for the CLI helpers."""
+
+from laserresist.cli import select_pins_from_config
+
+
+HOLES = [
+    {'x': 10.0, 'y': 5.0, 'diameter': 1.0},
+    {'x': 10.0, 'y': 30.0, 'diameter': 3.0},
+    {'x': 40.0, 'y': 30.0, 'diameter': 0.3},
+]
+
+
+def pin_config(pin1, pin2):
+    return {'pin1_x': pin1[0], 'pin1_y': pin1[1], 'pin2_x': pin2[0], 'pin2_y': pin2[1]}
+
+
+def test_select_pins_snaps_to_nearest_holes():
+    pins = select_pins_from_config(pin_config((10.2, 5.1), (10.0, 30.0)), HOLES)
+    assert pins == (HOLES[0], HOLES[1])
+
+
+def test_select_pins_snaps_within_hole_radius():
+    # 1.4mm away from the 3mm hole: outside the 0.5mm tolerance but inside its radius
+    pins = select_pins_from_config(pin_config((10.0, 5.0), (11.4, 30.0)), HOLES)
+    assert pins == (HOLES[0], HOLES[1])
+
+
+def test_select_pins_snaps_within_tolerance_of_small_hole():
+    pins = select_pins_from_config(pin_config((10.0, 5.0), (40.4, 30.0)), HOLES)
+    assert pins == (HOLES[0], HOLES[2])
+
+
+def test_select_pins_rejects_position_far_from_any_hole():
+    assert select_pins_from_config(pin_config((10.0, 5.0), (25.0, 15.0)), HOLES) is None
+
+
+def test_select_pins_rejects_both_pins_on_same_hole():
+    assert select_pins_from_config(pin_config((10.0, 5.0), (10.3, 5.2)), HOLES) is None
+
+
+def test_select_pins_rejects_missing_coordinates():
+    config = pin_config((10.0, 5.0), (10.0, 30.0))
+    del config['pin2_y']
+    assert select_pins_from_config(config, HOLES) is None
+
+
+def test_select_pins_rejects_board_without_holes():
+    assert select_pins_from_config(pin_config((10.0, 5.0), (10.0, 30.0)), []) is None